@@ -4,12 +4,19 @@ Apple Documentation Markdown to PDF Converter
 Converts framework documentation to searchable PDF with table of contents
 """
 
+import asyncio
+import os
+import shutil
 import subprocess
 import sys
+import traceback
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+from tqdm import tqdm
 import argparse
 
+from _markdown_io import iter_markdown_files, load_stripped
+
 
 class MarkdownToPDF:
     """Converts Markdown documentation to PDF"""
@@ -68,22 +75,26 @@ class MarkdownToPDF:
         },
     }
 
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, jobs: int = 1,
+                 pandoc_memory: str = '2G', pandoc_threads: int = 1):
         self.base_dir = Path(base_dir)
         self.markdown_dir = self.base_dir / 'markdown'
         self.pdf_dir = self.base_dir / 'pdf'
 
+        # Number of pandoc processes allowed to run at once
+        self.jobs = jobs
+        self._pandoc_slots = None
+
+        # Haskell runtime limits for pandoc (heap cap and parallel GC threads)
+        self.pandoc_memory = pandoc_memory
+        self.pandoc_threads = pandoc_threads
+
         # Create PDF directory
         self.pdf_dir.mkdir(parents=True, exist_ok=True)
 
     def check_pandoc(self) -> bool:
-        """Check if pandoc is installed"""
-        try:
-            result = subprocess.run(['pandoc', '--version'],
-                                   capture_output=True, text=True)
-            return result.returncode == 0
-        except FileNotFoundError:
-            return False
+        """Check if pandoc is installed (PATH lookup, no extra pandoc process)"""
+        return shutil.which('pandoc') is not None
 
     def get_framework_files(self, framework: str) -> List[Path]:
         """Get all markdown files for a framework, sorted"""
@@ -94,15 +105,16 @@ class MarkdownToPDF:
             return []
 
         # Get all .md files
-        files = list(framework_dir.rglob('*.md'))
+        root = str(framework_dir)
+        paths = list(iter_markdown_files(root))
 
         # Sort: root files first, then by path
-        def sort_key(path: Path):
-            relative = path.relative_to(framework_dir)
-            depth = len(relative.parts)
-            return (depth, str(relative).lower())
+        def sort_key(path: str):
+            relative = os.path.relpath(path, root)
+            depth = relative.count(os.sep) + 1
+            return (depth, relative.lower())
 
-        return sorted(files, key=sort_key)
+        return [Path(p) for p in sorted(paths, key=sort_key)]
 
     def create_title_page(self, framework: str) -> str:
         """Create a title page in Markdown"""
@@ -146,17 +158,10 @@ Offline Archive
 
 """
 
-    def process_markdown_file(self, file_path: Path, framework_dir: Path) -> str:
-        """Process a single markdown file for inclusion in combined PDF"""
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def process_markdown_file(self, file_path: Path, framework_dir: Path) -> bytes:
+        """Process a single markdown file for inclusion in combined PDF (UTF-8 encoded)"""
 
-        # Remove YAML frontmatter (between --- lines)
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                content = parts[2].strip()
+        content = load_stripped(file_path)
 
         # Add relative path as context
         relative_path = file_path.relative_to(framework_dir)
@@ -164,10 +169,45 @@ Offline Archive
         # Add page break and file reference
         header = f"\n\\newpage\n\n<!-- File: {relative_path} -->\n\n"
 
-        return header + content + "\n\n"
+        return (header + content + "\n\n").encode('utf-8')
+
+    async def convert_all(self, frameworks: List[str], max_files: int = None):
+        """Convert several frameworks, preparing the next one while pandoc runs"""
+        # Runs share per-framework file names, so each framework may only run once
+        frameworks = list(dict.fromkeys(frameworks))
+
+        # Ask all confirmation prompts before any pandoc run starts,
+        # so no run's timeout keeps counting while waiting for input
+        selected = []
+        for framework in frameworks:
+            try:
+                files = self.select_files(framework, max_files)
+            except Exception as e:
+                print(f"\n❌ Error converting {framework}: {e}")
+                traceback.print_exc()
+                continue
+
+            if files:
+                selected.append((framework, files))
+
+        results = await asyncio.gather(
+            *(self.build_pdf(framework, files) for framework, files in selected),
+            return_exceptions=True,
+        )
+
+        for (framework, _), result in zip(selected, results):
+            if isinstance(result, Exception):
+                print(f"\n❌ Error converting {framework}: {result}")
+                traceback.print_exception(type(result), result, result.__traceback__)
 
-    def convert_framework_to_pdf(self, framework: str, max_files: int = None):
+    async def convert_framework_to_pdf(self, framework: str, max_files: int = None):
         """Convert all markdown files for a framework to a single PDF"""
+        files = self.select_files(framework, max_files)
+        if files:
+            await self.build_pdf(framework, files)
+
+    def select_files(self, framework: str, max_files: int = None) -> List[Path]:
+        """Pick the files to include, asking for confirmation on very large frameworks"""
 
         config = self.FRAMEWORK_CONFIG.get(framework, {})
         recommended_max = config.get('recommended_max', 100)
@@ -180,7 +220,7 @@ Offline Archive
 
         if not files:
             print(f"No files found for {framework}")
-            return
+            return []
 
         total_files = len(files)
         print(f"Found {total_files} markdown files")
@@ -198,7 +238,7 @@ Offline Archive
                 response = input(f"\nProceed with ALL {total_files} files? (y/N): ")
                 if response.lower() != 'y':
                     print("Cancelled. Rerun with --max-files to specify a limit.")
-                    return
+                    return []
             files_to_use = files
         else:
             files_to_use = files[:max_files]
@@ -206,29 +246,35 @@ Offline Archive
             if max_files < recommended_max and total_files > recommended_max:
                 print(f"💡 Tip: Recommended is {recommended_max} files for this framework")
 
-        print(f"\nProcessing {len(files_to_use)} files...")
+        return files_to_use
 
-        # Create combined markdown
-        combined_md = self.create_title_page(framework)
+    def combine_markdown(self, framework: str, files_to_use: List[Path]) -> Path:
+        """Write the title page and all files into one markdown file for pandoc"""
+        print(f"\nProcessing {len(files_to_use)} files for {framework}...")
 
         framework_dir = self.markdown_dir / framework
+        combined_md_file = self.pdf_dir / f'{framework}_combined.md'
 
-        print("Processing files...")
-        for i, file_path in enumerate(files_to_use, 1):
-            if i % 100 == 0:
-                print(f"  Processed {i}/{len(files_to_use)} files...")
-
-            try:
-                combined_md += self.process_markdown_file(file_path, framework_dir)
-            except Exception as e:
-                print(f"  Warning: Error processing {file_path}: {e}")
+        # Stream combined markdown straight to disk, one file at a time
+        with open(combined_md_file, 'wb', buffering=1 << 20) as out:
+            out.write(self.create_title_page(framework).encode('utf-8'))
 
-        # Save combined markdown
-        combined_md_file = self.pdf_dir / f'{framework}_combined.md'
-        with open(combined_md_file, 'w', encoding='utf-8') as f:
-            f.write(combined_md)
+            for file_path in tqdm(files_to_use, desc=f"{framework} files"):
+                try:
+                    out.write(self.process_markdown_file(file_path, framework_dir))
+                except Exception as e:
+                    tqdm.write(f"  Warning: Error processing {file_path}: {e}")
 
         print(f"Combined markdown saved to: {combined_md_file}")
+        return combined_md_file
+
+    async def build_pdf(self, framework: str, files_to_use: List[Path]):
+        """Combine the selected files and run pandoc on them"""
+        # Blocking file I/O runs in a thread so other pandoc runs keep being serviced
+        loop = asyncio.get_running_loop()
+        combined_md_file = await loop.run_in_executor(
+            None, self.combine_markdown, framework, files_to_use
+        )
 
         # Convert to PDF using pandoc
         output_pdf = self.pdf_dir / f'{framework}_documentation.pdf'
@@ -250,15 +296,28 @@ Offline Archive
             '-V', 'colorlinks=true',
             '-V', 'linkcolor=blue',
             '-V', 'urlcolor=blue',
+            '+RTS', f'-M{self.pandoc_memory}', f'-N{self.pandoc_threads}', '-RTS',
         ]
 
-        try:
-            result = subprocess.run(pandoc_args,
-                                   capture_output=True,
-                                   text=True,
-                                   timeout=600)  # 10 minute timeout
+        if self._pandoc_slots is None:
+            self._pandoc_slots = asyncio.Semaphore(self.jobs)
 
-            if result.returncode == 0:
+        try:
+            async with self._pandoc_slots:
+                proc = await asyncio.create_subprocess_exec(
+                    *pandoc_args,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                try:
+                    _, stderr = await asyncio.wait_for(proc.communicate(),
+                                                       timeout=600)  # 10 minute timeout
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
+
+            if proc.returncode == 0:
                 print(f"\n✅ PDF created successfully: {output_pdf}")
 
                 # Get file size
@@ -270,16 +329,59 @@ Offline Archive
 
             else:
                 print(f"\n❌ Error creating PDF:")
-                print(result.stderr)
+                print(stderr.decode('utf-8', errors='replace'))
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             print("\n❌ PDF generation timed out (>10 minutes)")
             print("   Try with --max-files to create a smaller PDF")
         except Exception as e:
             print(f"\n❌ Error running pandoc: {e}")
 
 
-def main():
+def available_memory_gb() -> Optional[float]:
+    """Memory available for new processes in GB, or None if it cannot be determined"""
+    # Linux: MemAvailable counts reclaimable page cache, unlike MemFree
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / (1024 ** 2)
+    except OSError:
+        pass
+
+    # macOS: only total memory is cheap to query; budget half of it
+    try:
+        result = subprocess.run(['sysctl', '-n', 'hw.memsize'],
+                                capture_output=True, text=True)
+        if result.returncode == 0:
+            return int(result.stdout.strip()) / (1024 ** 3) / 2
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def default_jobs() -> int:
+    """Pick a worker count that fits CPU and memory (pandoc peaks around 2 GB)"""
+    cpus = os.cpu_count() or 1
+
+    free_gb = available_memory_gb()
+    if free_gb is None:
+        # Unknown memory: stay conservative rather than start one run per core
+        return min(cpus, 2)
+
+    return max(1, min(cpus, int(free_gb // 2)))
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that need at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+async def main():
     parser = argparse.ArgumentParser(
         description='Convert Markdown documentation to PDF',
         epilog="""
@@ -292,6 +394,9 @@ Examples:
 
   # Convert multiple frameworks
   python scripts/04_markdown_to_pdf.py --framework swift swiftui
+
+  # Run at most two pandoc processes at a time
+  python scripts/04_markdown_to_pdf.py --framework swift swiftui uikit --jobs 2
         """
     )
 
@@ -301,12 +406,24 @@ Examples:
                        help='Base directory (default: project directory)')
     parser.add_argument('--max-files', type=int,
                        help='Maximum number of files to include (for testing)')
+    parser.add_argument('--jobs', type=positive_int, default=default_jobs(),
+                       help='Maximum pandoc processes running at once '
+                            '(default: limited by CPU count and free memory)')
+    parser.add_argument('--pandoc-memory', default='2G',
+                       help='Maximum heap size per pandoc run, e.g. 2G or 1500M (default: 2G)')
+    parser.add_argument('--pandoc-threads', type=positive_int,
+                       help='Threads per pandoc run (default: CPU count divided by --jobs)')
 
     args = parser.parse_args()
 
     base_dir = Path(__file__).parent.parent / args.base_dir if args.base_dir == '.' else Path(args.base_dir)
 
-    converter = MarkdownToPDF(base_dir=base_dir)
+    pandoc_threads = args.pandoc_threads or max(1, (os.cpu_count() or 1) // args.jobs)
+
+    converter = MarkdownToPDF(base_dir=base_dir,
+                              jobs=args.jobs,
+                              pandoc_memory=args.pandoc_memory,
+                              pandoc_threads=pandoc_threads)
 
     # Check if pandoc is installed
     if not converter.check_pandoc():
@@ -317,14 +434,8 @@ Examples:
         print("  Windows: choco install pandoc miktex")
         sys.exit(1)
 
-    # Convert each framework
-    for framework in args.framework:
-        try:
-            converter.convert_framework_to_pdf(framework, max_files=args.max_files)
-        except Exception as e:
-            print(f"\n❌ Error converting {framework}: {e}")
-            import traceback
-            traceback.print_exc()
+    # Convert all frameworks; pandoc runs overlap with preparing the next framework
+    await converter.convert_all(args.framework, max_files=args.max_files)
 
     print("\n" + "="*70)
     print("PDF Generation Complete!")
@@ -333,4 +444,4 @@ Examples:
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())
@@ -4,25 +4,304 @@ Apple Documentation HTML Generator
 Creates a browsable, searchable HTML documentation site
 """
 
+import hashlib
+import html
 import json
+import os
+import queue
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional, Tuple
+from tqdm import tqdm
 import argparse
 import markdown
+import requests
 import shutil
 
+from _markdown_io import iter_markdown_files, load_stripped
+
+# Optional C-backed CommonMark/GFM parser, much faster than python-markdown
+try:
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as CmarkOptions
+except ImportError:
+    cmarkgfm = None
+
+# Optional syntax highlighting for cmarkgfm output
+try:
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+except ImportError:
+    highlight = None
+
+CODE_BLOCK_RE = re.compile(r'<pre lang="([^"]+)"><code>(.*?)</code></pre>', re.DOTALL)
+
 
 class HTMLGenerator:
     """Generates browsable HTML documentation"""
 
-    def __init__(self, base_dir: Path):
+    # Seconds the pandoc server may spend on one page (pandoc's default is 2)
+    PANDOC_TIMEOUT = 60
+
+    # Constant parts of the page template (only title, framework and content vary)
+    _TEMPLATE_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+"""
+
+    # Page stylesheet, written once to html/assets/style.css
+    STYLESHEET = """* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+    line-height: 1.6;
+    color: #333;
+    background: #f5f5f7;
+}
+
+.container {
+    max-width: 1000px;
+    margin: 0 auto;
+    padding: 20px;
+    background: white;
+    min-height: 100vh;
+}
+
+header {
+    background: #000;
+    color: white;
+    padding: 20px;
+    margin: -20px -20px 20px -20px;
+}
+
+header h1 {
+    font-size: 24px;
+    font-weight: 600;
+}
+
+header .breadcrumb {
+    font-size: 14px;
+    opacity: 0.8;
+    margin-top: 5px;
+}
+
+header .breadcrumb a {
+    color: #0071e3;
+    text-decoration: none;
+}
+
+header .breadcrumb a:hover {
+    text-decoration: underline;
+}
+
+.content {
+    padding: 20px 0;
+}
+
+h1, h2, h3, h4, h5, h6 {
+    margin: 1.5em 0 0.5em 0;
+    font-weight: 600;
+}
+
+h1 { font-size: 2em; border-bottom: 1px solid #e5e5e5; padding-bottom: 0.3em; }
+h2 { font-size: 1.5em; }
+h3 { font-size: 1.25em; }
+
+code {
+    background: #f5f5f7;
+    padding: 2px 6px;
+    border-radius: 3px;
+    font-family: 'SF Mono', Monaco, monospace;
+    font-size: 0.9em;
+}
+
+pre {
+    background: #1d1f21;
+    color: #c5c8c6;
+    padding: 15px;
+    border-radius: 6px;
+    overflow-x: auto;
+    margin: 1em 0;
+}
+
+pre code {
+    background: transparent;
+    padding: 0;
+    color: inherit;
+}
+
+a {
+    color: #0071e3;
+    text-decoration: none;
+}
+
+a:hover {
+    text-decoration: underline;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 1em 0;
+}
+
+th, td {
+    border: 1px solid #e5e5e5;
+    padding: 8px 12px;
+    text-align: left;
+}
+
+th {
+    background: #f5f5f7;
+    font-weight: 600;
+}
+
+blockquote {
+    border-left: 4px solid #0071e3;
+    padding-left: 1em;
+    margin: 1em 0;
+    color: #666;
+}
+
+ul, ol {
+    margin-left: 2em;
+    margin-bottom: 1em;
+}
+
+li {
+    margin: 0.5em 0;
+}
+
+.back-link {
+    display: inline-block;
+    margin-bottom: 20px;
+    color: #0071e3;
+    text-decoration: none;
+}
+
+.back-link:hover {
+    text-decoration: underline;
+}
+"""
+
+    _TEMPLATE_TAIL = """        </div>
+    </div>
+</body>
+</html>
+"""
+
+    def __init__(self, base_dir: Path, pandoc_url: Optional[str] = None):
         self.base_dir = Path(base_dir)
         self.markdown_dir = self.base_dir / 'markdown'
         self.html_dir = self.base_dir / 'html'
 
+        # Optional pandoc server used instead of the Python converters
+        self.pandoc_url = pandoc_url
+        self._pandoc_server = None
+        self._session = None
+
+        # Per-framework page template pieces, see framework_fragments()
+        self._fragment_cache: Dict[str, Tuple[str, str, str]] = {}
+
         # Create HTML directory
         self.html_dir.mkdir(parents=True, exist_ok=True)
 
+        # Reusable Markdown converter (extension setup is expensive)
+        self._md = markdown.Markdown(
+            extensions=['fenced_code', 'tables', 'toc', 'codehilite']
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop_pandoc_server()
+
+    def start_pandoc_server(self, port: int = 3030) -> str:
+        """Start a local pandoc server so pages are converted without a process per file"""
+        if shutil.which('pandoc') is None:
+            raise RuntimeError("pandoc is not installed")
+
+        # Refuse to start if another process already listens on the port,
+        # otherwise its answers would be taken for our server's
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex(('localhost', port)) == 0:
+                raise RuntimeError(f"port {port} is already in use; pick another with --pandoc-port")
+
+        self._pandoc_server = subprocess.Popen(
+            ['pandoc', 'server', '--port', str(port), '--timeout', str(self.PANDOC_TIMEOUT)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        url = f'http://localhost:{port}/'
+
+        # Wait until the server accepts connections
+        for _ in range(50):
+            if self._pandoc_server.poll() is not None:
+                self._pandoc_server = None
+                raise RuntimeError(f"pandoc server exited (requires pandoc 3.0+ and a free port {port})")
+
+            try:
+                requests.get(url + 'version', timeout=1)
+                break
+            except requests.RequestException:
+                time.sleep(0.1)
+        else:
+            self.stop_pandoc_server()
+            raise RuntimeError(f"pandoc server did not start on port {port}")
+
+        # The answer must come from the process we started, not a server that grabbed the port
+        if self._pandoc_server.poll() is not None:
+            self._pandoc_server = None
+            raise RuntimeError(f"pandoc server exited; is port {port} already in use?")
+
+        self.pandoc_url = url
+        return url
+
+    def stop_pandoc_server(self):
+        """Shut down the pandoc server if this generator started one"""
+        if self._pandoc_server is not None:
+            self._pandoc_server.terminate()
+            self._pandoc_server.wait()
+            self._pandoc_server = None
+
+    def pandoc_to_html(self, content: str) -> str:
+        """Convert markdown to HTML through the pandoc server (keep-alive session)"""
+        if self._session is None:
+            self._session = requests.Session()
+
+        response = self._session.post(
+            self.pandoc_url,
+            json={'text': content, 'from': 'markdown', 'to': 'html'},
+            headers={'Accept': 'application/json'},
+            timeout=self.PANDOC_TIMEOUT + 5,
+        )
+
+        try:
+            result = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise RuntimeError(f"pandoc server returned invalid JSON: {response.text[:200]}")
+
+        if isinstance(result, dict) and 'error' in result:
+            raise RuntimeError(f"pandoc: {result['error']}")
+        response.raise_for_status()
+        return result['output']
+
     def get_all_frameworks(self) -> List[str]:
         """Get list of all frameworks"""
         if not self.markdown_dir.exists():
@@ -37,199 +316,143 @@ class HTMLGenerator:
         if not framework_dir.exists():
             return []
 
-        return sorted(framework_dir.rglob('*.md'))
+        # Sort by path components, matching Path ordering
+        paths = sorted(iter_markdown_files(str(framework_dir)), key=lambda p: p.split(os.sep))
+        return [Path(p) for p in paths]
 
     def convert_markdown_to_html(self, md_file: Path, framework: str) -> str:
         """Convert markdown file to HTML"""
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Remove YAML frontmatter
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                content = parts[2].strip()
+        return self.render_page(load_stripped(md_file), md_file, framework)
 
+    def render_page(self, content: str, md_file: Path, framework: str) -> str:
+        """Convert markdown text (frontmatter already stripped) from md_file to a full HTML page"""
         # Convert to HTML
-        html_content = markdown.markdown(
-            content,
-            extensions=['fenced_code', 'tables', 'toc', 'codehilite']
-        )
+        if self.pandoc_url:
+            html_content = self.pandoc_to_html(content)
+        elif cmarkgfm is not None:
+            html_content = cmarkgfm.github_flavored_markdown_to_html(
+                content, options=CmarkOptions.CMARK_OPT_UNSAFE
+            )
+            html_content = self.highlight_code_blocks(html_content)
+        else:
+            self._md.reset()
+            html_content = self._md.convert(content)
 
         # Get relative path for title
         framework_dir = self.markdown_dir / framework
         rel_path = md_file.relative_to(framework_dir)
         title = str(rel_path.with_suffix(''))
+        stylesheet = '../' * len(rel_path.parts) + 'assets/style.css'
 
         # Wrap in template
-        return self.html_template(title, html_content, framework)
-
-    def html_template(self, title: str, content: str, framework: str) -> str:
-        """HTML page template"""
-        return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - {framework}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: #f5f5f7;
-        }}
-
-        .container {{
-            max-width: 1000px;
-            margin: 0 auto;
-            padding: 20px;
-            background: white;
-            min-height: 100vh;
-        }}
-
-        header {{
-            background: #000;
-            color: white;
-            padding: 20px;
-            margin: -20px -20px 20px -20px;
-        }}
-
-        header h1 {{
-            font-size: 24px;
-            font-weight: 600;
-        }}
-
-        header .breadcrumb {{
-            font-size: 14px;
-            opacity: 0.8;
-            margin-top: 5px;
-        }}
-
-        header .breadcrumb a {{
-            color: #0071e3;
-            text-decoration: none;
-        }}
-
-        header .breadcrumb a:hover {{
-            text-decoration: underline;
-        }}
-
-        .content {{
-            padding: 20px 0;
-        }}
-
-        h1, h2, h3, h4, h5, h6 {{
-            margin: 1.5em 0 0.5em 0;
-            font-weight: 600;
-        }}
-
-        h1 {{ font-size: 2em; border-bottom: 1px solid #e5e5e5; padding-bottom: 0.3em; }}
-        h2 {{ font-size: 1.5em; }}
-        h3 {{ font-size: 1.25em; }}
-
-        code {{
-            background: #f5f5f7;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: 'SF Mono', Monaco, monospace;
-            font-size: 0.9em;
-        }}
-
-        pre {{
-            background: #1d1f21;
-            color: #c5c8c6;
-            padding: 15px;
-            border-radius: 6px;
-            overflow-x: auto;
-            margin: 1em 0;
-        }}
-
-        pre code {{
-            background: transparent;
-            padding: 0;
-            color: inherit;
-        }}
-
-        a {{
-            color: #0071e3;
-            text-decoration: none;
-        }}
-
-        a:hover {{
-            text-decoration: underline;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 1em 0;
-        }}
-
-        th, td {{
-            border: 1px solid #e5e5e5;
-            padding: 8px 12px;
-            text-align: left;
-        }}
-
-        th {{
-            background: #f5f5f7;
-            font-weight: 600;
-        }}
-
-        blockquote {{
-            border-left: 4px solid #0071e3;
-            padding-left: 1em;
-            margin: 1em 0;
-            color: #666;
-        }}
-
-        ul, ol {{
-            margin-left: 2em;
-            margin-bottom: 1em;
-        }}
-
-        li {{
-            margin: 0.5em 0;
-        }}
-
-        .back-link {{
-            display: inline-block;
-            margin-bottom: 20px;
-            color: #0071e3;
-            text-decoration: none;
-        }}
-
-        .back-link:hover {{
-            text-decoration: underline;
-        }}
-    </style>
-</head>
+        return self.html_template(title, html_content, framework, stylesheet)
+
+    def highlight_code_blocks(self, html_content: str) -> str:
+        """Highlight fenced code blocks in cmarkgfm output with pygments"""
+        if highlight is None or '<pre lang="' not in html_content:
+            return html_content
+
+        def replace(match):
+            try:
+                lexer = get_lexer_by_name(match.group(1))
+            except ClassNotFound:
+                return match.group(0)
+
+            code = html.unescape(match.group(2))
+            return highlight(code, lexer, HtmlFormatter(cssclass='codehilite'))
+
+        return CODE_BLOCK_RE.sub(replace, html_content)
+
+    def framework_fragments(self, framework: str) -> Tuple[str, str, str]:
+        """Page template pieces that only depend on the framework (built once per framework)"""
+        if framework not in self._fragment_cache:
+            name = html.escape(framework)
+            title_end = f" - {name}</title>\n"
+            header = f"""</head>
 <body>
     <div class="container">
         <header>
             <div class="breadcrumb">
                 <a href="../../index.html">Home</a> ›
-                <a href="../index.html">{framework}</a> ›
-                {title}
-            </div>
-            <h1>{title}</h1>
+                <a href="../index.html">{name}</a> ›
+                """
+            content_start = f"""</h1>
         </header>
 
         <div class="content">
-            <a href="../index.html" class="back-link">← Back to {framework}</a>
-            {content}
-        </div>
-    </div>
-</body>
-</html>
-"""
+            <a href="../index.html" class="back-link">← Back to {name}</a>
+            """
+            self._fragment_cache[framework] = (title_end, header, content_start)
+
+        return self._fragment_cache[framework]
+
+    def html_template(self, title: str, content: str, framework: str,
+                      stylesheet: str = '../assets/style.css') -> str:
+        """HTML page template"""
+        title_end, header, content_start = self.framework_fragments(framework)
+        title = html.escape(title)
+
+        return ''.join((
+            self._TEMPLATE_HEAD,
+            '    <title>', title, title_end,
+            '    <link rel="stylesheet" href="', stylesheet, '">\n',
+            header, title,
+            '\n            </div>\n            <h1>', title, content_start,
+            content, '\n',
+            self._TEMPLATE_TAIL,
+        ))
+
+    def convert_pipelined(self, tasks: List[Tuple[Path, str, Path]]) -> Iterator[Optional[str]]:
+        """Convert pages in this process, reading and writing files on background threads
+
+        Yields one error message (or None) per task, in order. Write errors are
+        reported by the writer threads as they happen.
+        """
+        read_queue = queue.Queue(maxsize=64)
+
+        # Bound the pages waiting to be written, like the read queue
+        pending_writes = threading.BoundedSemaphore(64)
+
+        def reader():
+            for md_file, framework, html_file in tasks:
+                try:
+                    read_queue.put((md_file, framework, html_file, load_stripped(md_file), None))
+                except Exception as e:
+                    read_queue.put((md_file, framework, html_file, None, str(e)))
+            read_queue.put(None)
+
+        def write(md_file, html_file, html_bytes):
+            try:
+                html_file.parent.mkdir(parents=True, exist_ok=True)
+                html_file.write_bytes(html_bytes)
+            except Exception as e:
+                tqdm.write(f"  Error converting {md_file}: {e}")
+            finally:
+                pending_writes.release()
+
+        reader_thread = threading.Thread(target=reader, daemon=True)
+        reader_thread.start()
+        writer_pool = ThreadPoolExecutor(max_workers=8)
+
+        try:
+            while True:
+                item = read_queue.get()
+                if item is None:
+                    break
+
+                md_file, framework, html_file, content, error = item
+                if error is None:
+                    try:
+                        html_content = self.render_page(content, md_file, framework)
+                        pending_writes.acquire()
+                        writer_pool.submit(write, md_file, html_file,
+                                           html_content.encode('utf-8'))
+                    except Exception as e:
+                        error = str(e)
+
+                yield error
+        finally:
+            writer_pool.shutdown(wait=True)
 
     def generate_framework_index(self, framework: str, files: List[Path]) -> str:
         """Generate index page for a framework"""
@@ -241,9 +464,10 @@ class HTMLGenerator:
             html_path = rel_path.with_suffix('.html')
             title = rel_path.stem
 
-            items.append(f'<li><a href="{html_path}">{title}</a></li>')
+            items.append(f'<li><a href="{html.escape(str(html_path))}">{html.escape(title)}</a></li>')
 
         items_html = '\n'.join(items)
+        framework = html.escape(framework)
 
         return f"""<!DOCTYPE html>
 <html lang="en">
@@ -358,7 +582,8 @@ class HTMLGenerator:
         """Generate main index page"""
         items = []
         for framework, count in sorted(frameworks.items()):
-            items.append(f'<li><a href="{framework}/index.html">{framework} <span class="count">({count} pages)</span></a></li>')
+            name = html.escape(framework)
+            items.append(f'<li><a href="{name}/index.html">{name} <span class="count">({count} pages)</span></a></li>')
 
         items_html = '\n'.join(items)
         total = sum(frameworks.values())
@@ -454,8 +679,31 @@ class HTMLGenerator:
 </html>
 """
 
-    def generate_html(self, frameworks: List[str] = None):
-        """Generate HTML documentation"""
+    def build_fingerprint(self) -> str:
+        """Identify the generator code, Markdown loader and renderer, so changing any forces a rebuild"""
+        if self.pandoc_url:
+            renderer = 'pandoc'
+        elif cmarkgfm is not None:
+            renderer = 'cmarkgfm'
+        else:
+            renderer = 'markdown'
+
+        # Page bodies also depend on the shared loader in _markdown_io.py
+        digest = hashlib.sha1(Path(__file__).read_bytes())
+        digest.update(Path(load_stripped.__code__.co_filename).read_bytes())
+        digest.update(renderer.encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_up_to_date(self, md_file: Path, html_file: Path) -> bool:
+        """Check whether html_file is at least as new as its markdown source"""
+        try:
+            return os.stat(html_file).st_mtime >= os.stat(md_file).st_mtime
+        except FileNotFoundError:
+            return False
+
+    def generate_html(self, frameworks: List[str] = None, jobs: Optional[int] = None,
+                      force: bool = False):
+        """Generate HTML documentation (only changed pages unless force is set)"""
         if frameworks is None:
             frameworks = self.get_all_frameworks()
 
@@ -466,6 +714,20 @@ class HTMLGenerator:
         print(f"\nGenerating HTML documentation for {len(frameworks)} frameworks...")
 
         framework_stats = {}
+        fingerprint = self.build_fingerprint()
+
+        # Shared stylesheet for all documentation pages
+        assets_dir = self.html_dir / 'assets'
+        assets_dir.mkdir(parents=True, exist_ok=True)
+        (assets_dir / 'style.css').write_bytes(self.STYLESHEET.encode('utf-8'))
+
+        # A single job converts in this process with threaded file I/O instead
+        workers = jobs or os.cpu_count() or 1
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_worker,
+                                           initargs=(self.base_dir, self.pandoc_url))
 
         for framework in frameworks:
             print(f"\nProcessing {framework}...")
@@ -482,37 +744,47 @@ class HTMLGenerator:
             framework_html_dir = self.html_dir / framework
             framework_html_dir.mkdir(parents=True, exist_ok=True)
 
-            # Convert all markdown files
-            for i, md_file in enumerate(files, 1):
-                if i % 100 == 0:
-                    print(f"  Converted {i}/{len(files)} files...")
-
-                try:
-                    html_content = self.convert_markdown_to_html(md_file, framework)
-
-                    # Save HTML file
-                    framework_dir = self.markdown_dir / framework
-                    rel_path = md_file.relative_to(framework_dir)
-                    html_file = framework_html_dir / rel_path.with_suffix('.html')
-                    html_file.parent.mkdir(parents=True, exist_ok=True)
-
-                    with open(html_file, 'w', encoding='utf-8') as f:
-                        f.write(html_content)
-
-                except Exception as e:
-                    print(f"  Error converting {md_file}: {e}")
+            # Rebuild every page if the generator changed since the last build
+            stamp_file = framework_html_dir / '.build_stamp'
+            rebuild_all = force or not stamp_file.exists() or stamp_file.read_text() != fingerprint
+
+            # Convert new and changed markdown files
+            framework_dir = self.markdown_dir / framework
+            tasks = []
+            for md_file in files:
+                rel_path = md_file.relative_to(framework_dir)
+                html_file = framework_html_dir / rel_path.with_suffix('.html')
+                if rebuild_all or not self.is_up_to_date(md_file, html_file):
+                    tasks.append((md_file, framework, html_file))
+
+            if len(tasks) < len(files):
+                print(f"  Skipping {len(files) - len(tasks)} unchanged files")
+
+            if executor is not None:
+                results = executor.map(_convert_one, tasks, chunksize=32)
+            else:
+                results = self.convert_pipelined(tasks)
+
+            # results first, so the pipeline runs to completion and flushes its writes
+            progress = tqdm(zip(results, tasks), total=len(tasks), desc=f"{framework} pages")
+            for error, (md_file, _, _) in progress:
+                if error:
+                    tqdm.write(f"  Error converting {md_file}: {error}")
 
             # Generate framework index
             index_html = self.generate_framework_index(framework, files)
             index_file = framework_html_dir / 'index.html'
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(index_html)
+            index_file.write_bytes(index_html.encode('utf-8'))
+
+            stamp_file.write_text(fingerprint)
+
+        if executor is not None:
+            executor.shutdown()
 
         # Generate main index
         main_index = self.generate_main_index(framework_stats)
         main_index_file = self.html_dir / 'index.html'
-        with open(main_index_file, 'w', encoding='utf-8') as f:
-            f.write(main_index)
+        main_index_file.write_bytes(main_index.encode('utf-8'))
 
         print("\n" + "="*70)
         print("HTML Documentation Generated!")
@@ -522,17 +794,75 @@ class HTMLGenerator:
         print(f"Total pages: {sum(framework_stats.values()):,}")
 
 
+# Per-process generator, created once by _init_worker
+_worker_generator: Optional[HTMLGenerator] = None
+
+
+def _init_worker(base_dir: Path, pandoc_url: Optional[str]):
+    """Set up the generator used by a worker process"""
+    global _worker_generator
+    _worker_generator = HTMLGenerator(base_dir=base_dir, pandoc_url=pandoc_url)
+
+
+def _convert_one(task: Tuple[Path, str, Path]) -> Optional[str]:
+    """Convert and save a single page (runs in a worker process)"""
+    md_file, framework, html_file = task
+
+    try:
+        html_content = _worker_generator.convert_markdown_to_html(md_file, framework)
+
+        html_file.parent.mkdir(parents=True, exist_ok=True)
+        html_file.write_bytes(html_content.encode('utf-8'))
+
+    except Exception as e:
+        return str(e)
+
+    return None
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that need at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate HTML documentation')
     parser.add_argument('--frameworks', nargs='+', help='Frameworks to convert (default: all)')
     parser.add_argument('--base-dir', default='.', help='Base directory')
+    parser.add_argument('--jobs', type=positive_int, default=os.cpu_count() or 1,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--pandoc', action='store_true',
+                        help='Render pages with a local pandoc server (requires pandoc 3.0+)')
+    parser.add_argument('--pandoc-port', type=int, default=3030,
+                        help='Port for the pandoc server (default: 3030)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate all pages, including unchanged ones')
 
     args = parser.parse_args()
 
     base_dir = Path(__file__).parent.parent / args.base_dir if args.base_dir == '.' else Path(args.base_dir)
 
-    generator = HTMLGenerator(base_dir=base_dir)
-    generator.generate_html(frameworks=args.frameworks)
+    with HTMLGenerator(base_dir=base_dir) as generator:
+        if args.pandoc:
+            if shutil.which('pandoc') is None:
+                print("❌ Error: pandoc is not installed")
+                print("\nTo install pandoc 3.0+:")
+                print("  macOS:   brew install pandoc")
+                print("  Linux:   https://pandoc.org/installing.html")
+                print("  Windows: choco install pandoc")
+                sys.exit(1)
+
+            try:
+                generator.start_pandoc_server(port=args.pandoc_port)
+            except (OSError, RuntimeError) as e:
+                print(f"❌ Error: could not start pandoc server: {e}")
+                sys.exit(1)
+
+        generator.generate_html(frameworks=args.frameworks, jobs=args.jobs,
+                                force=args.force)
 
     print("\nNext: Open html/index.html in your browser!")
 
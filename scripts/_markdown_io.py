@@ -0,0 +1,70 @@
+"""
+Shared Markdown loading for the PDF and HTML generators
+Finds converted documentation files and strips their YAML frontmatter
+"""
+
+import mmap
+import os
+from pathlib import Path
+from typing import Iterator
+
+# Files at least this large are memory-mapped instead of read whole
+MMAP_THRESHOLD = 1024 * 1024
+
+# ASCII bytes that str.strip() treats as whitespace
+_STRIP_BYTES = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+
+def iter_markdown_files(root: str) -> Iterator[str]:
+    """Yield paths of all .md files under root (os.scandir avoids extra stat calls)"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_markdown_files(entry.path)
+            elif entry.name.endswith('.md'):
+                yield entry.path
+
+
+def strip_frontmatter(content: str) -> str:
+    """Remove YAML frontmatter (between --- lines, found without splitting the file)"""
+    if content.startswith('---\n'):
+        end = content.find('\n---', 3)
+        if end != -1:
+            content = content[end + 4:].strip()
+
+    return content
+
+
+def _decode(data) -> str:
+    """Decode UTF-8 bytes (or a buffer view) with the same newline handling as text mode"""
+    content = str(data, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def load_stripped(path: Path) -> str:
+    """Read a markdown file and return its body without frontmatter"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return strip_frontmatter(_decode(f.read()))
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Locate frontmatter on the mapped bytes and decode only the body,
+            # straight from the mapping without an intermediate bytes copy
+            if mm[:4] == b'---\n':
+                end = mm.find(b'\n---', 3)
+                # A \r inside the frontmatter could move the closing marker in text mode
+                if end != -1 and mm.find(b'\r', 0, end + 4) == -1:
+                    # Trim surrounding whitespace on the bytes so strip() has nothing to copy
+                    start, stop = end + 4, len(mm)
+                    while start < stop and mm[start] in _STRIP_BYTES:
+                        start += 1
+                    while stop > start and mm[stop - 1] in _STRIP_BYTES:
+                        stop -= 1
+
+                    with memoryview(mm) as view:
+                        return _decode(view[start:stop]).strip()
+
+            with memoryview(mm) as view:
+                return strip_frontmatter(_decode(view))